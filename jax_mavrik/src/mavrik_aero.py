@@ -84,7 +84,7 @@ class MavrikAero:
     def __init__(self, mavrik_setup: MavrikSetup):
         self.get_lookup_table(mavrik_setup)
  
-    def __call__(self, state: StateVariables, control: ControlInputs) -> Tuple[Forces, Moments]:
+    def __call__(self, state: StateVariables, control: ControlInputs, return_components: bool = False) -> Tuple[Forces, Moments]:
         # Calculate forces and moments using Mavrik Aero model
         # Transform body frame velocities (u, v, w) to inertial frame velocities (Vx, Vy, Vz)
         R = euler_to_dcm(state.roll, state.pitch, state.yaw)
@@ -126,9 +126,8 @@ class MavrikAero:
         tail_transform = np.array([[np.cos(actuator_outputs.tail_tilt), 0, np.sin(actuator_outputs.tail_tilt)], [0, 1, 0], [-np.sin(actuator_outputs.tail_tilt), 0., np.cos(actuator_outputs.tail_tilt)]])
 
         #forces, moments, actuator_outputs = self.parallel_interpolate(actuator_outputs, wing_transform, tail_transform)
-        forces, moments, actuator_outputs = self.interpolate(actuator_outputs, wing_transform, tail_transform)
-
-        return forces, moments, actuator_outputs
+        # With return_components, the per-coefficient contributions summed into forces/moments are returned as a 4th element
+        return self.interpolate(actuator_outputs, wing_transform, tail_transform, return_components=return_components)
     
     def parallel_interpolate(self, actuator_outputs: ActuatorOutput, wing_transform: FloatScalar, tail_transform: FloatScalar) -> Tuple[Forces, Moments, ActuatorOutput]: 
         # Use a Pool to run functions in parallel
@@ -183,7 +182,7 @@ class MavrikAero:
         
 
 
-    def interpolate(self, actuator_outputs: ActuatorOutput, wing_transform: FloatScalar, tail_transform: FloatScalar) -> Tuple[Forces, Moments, ActuatorOutput]:
+    def interpolate(self, actuator_outputs: ActuatorOutput, wing_transform: FloatScalar, tail_transform: FloatScalar, return_components: bool = False) -> Tuple[Forces, Moments, ActuatorOutput]:
         F0, M0 = self.Ct(actuator_outputs, wing_transform, tail_transform)
         '''
         for key, value in F0._asdict().items():
@@ -248,6 +247,9 @@ class MavrikAero:
                           M0.N + M1.N + M2.N + M3.N + M5.N, # + moments_by_forces[2]
                           )
 
+        if return_components:
+            components = {"Ct": (F0, M0), "Cx": F1, "Cy": F2, "Cz": F3, "L": M1, "M": M2, "N": M3, "Kq": M5}
+            return forces, moments, actuator_outputs, components
         return forces, moments, actuator_outputs
     
 
@@ -484,9 +486,6 @@ class MavrikAero:
         CY_Scale_p = 0.5744 * 2.8270 * 1.225 * 0.25 * u.U * u.p
         CY_Scale_q = 0.5744 * 0.2032 * 1.225 * 0.25 * u.U * u.q
 
-        wing_transform = np.array([[np.cos(u.wing_tilt), 0, np.sin( u.wing_tilt)], [0, 1, 0], [-np.sin(u.wing_tilt), 0., np.cos(u.wing_tilt)]]);
-        tail_transform = np.array([[np.cos(u.tail_tilt), 0, np.sin(u.tail_tilt)], [0, 1, 0], [-np.sin(u.tail_tilt), 0., np.cos(u.tail_tilt)]])
-     
         CY_aileron_wing = self.CY_aileron_wing_lookup_table(np.array([
             u.wing_alpha, u.wing_beta, u.U, u.wing_RPM, u.wing_prop_alpha, u.wing_prop_beta, u.aileron
         ]))
@@ -92,15 +92,16 @@ def euler_to_dcm(roll, pitch, yaw):
         phi (float): Roll angle.
         theta (float): Pitch angle.
         psi (float): Yaw angle.
+        The angles may also be arrays of a common (broadcastable) batch shape.
     
     Returns:
-        jax.numpy.ndarray: The 3x3 Direction Cosine Matrix (DCM).
+        jax.numpy.ndarray: The 3x3 Direction Cosine Matrix (DCM), or a (..., 3, 3) stack of them.
     """
     
     # phi, theta, psi = euler_angles
     cos, sin =jnp.cos, jnp.sin
     array = jnp.asarray
-    
+    roll, pitch, yaw = jnp.broadcast_arrays(roll, pitch, yaw)
         
     s_roll = sin(roll) #1
     s_pitch = sin(pitch) #2
@@ -110,12 +111,13 @@ def euler_to_dcm(roll, pitch, yaw):
     c_pitch = cos(pitch) #5
     c_yaw = cos(yaw) #6
 
-    # Rotation matrix from body frame to inertial frame
-    return jnp.array([
-        [c_roll * c_pitch, s_roll * c_pitch, -s_pitch],
-        [c_roll * s_pitch * s_yaw - s_roll * c_yaw, s_roll * s_pitch * s_yaw + c_roll * c_yaw, c_pitch * s_yaw],
-        [c_roll * s_pitch * c_yaw + s_roll * s_yaw, s_roll * s_pitch * c_yaw - c_roll * s_yaw, c_pitch * c_yaw]
-    ])
+    # Rotation matrix from body frame to inertial frame; the nine entries are stacked on a trailing
+    # axis so a batch of angles yields one (..., 3, 3) array
+    return jnp.stack([
+        c_roll * c_pitch, s_roll * c_pitch, -s_pitch,
+        c_roll * s_pitch * s_yaw - s_roll * c_yaw, s_roll * s_pitch * s_yaw + c_roll * c_yaw, c_pitch * s_yaw,
+        c_roll * s_pitch * c_yaw + s_roll * s_yaw, s_roll * s_pitch * c_yaw - c_roll * s_yaw, c_pitch * c_yaw
+    ], axis=-1).reshape(*roll.shape, 3, 3)
     '''
     return jnp.array([
         [c_pitch * c_yaw, c_pitch * s_yaw, -s_pitch],
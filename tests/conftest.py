@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+# The test workloads are small and trivially CPU-sized: keep JAX from reserving most of an
+# accelerator's memory up front, and run everything on the host so no constants cross PCIe.
+# Both variables must be set before jax is first imported.
+os.environ.setdefault("XLA_PYTHON_CLIENT_PREALLOCATE", "false")
+os.environ.setdefault("JAX_PLATFORMS", "cpu")
+
+import jax  # noqa: E402
+
+jax.config.update("jax_default_device", jax.devices("cpu")[0])
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "xdist_group(name): run the marked tests on one pytest-xdist worker")
+
+
+def pytest_collection_modifyitems(items):
+    # Under `pytest -n auto --dist loadgroup`, the aero tests share one worker so its session fixture parses
+    # the .mat tables and the jitted helpers compile once instead of once per worker
+    for item in items:
+        if item.path.name == "test_mavrik_aero.py":
+            item.add_marker(pytest.mark.xdist_group("aero_session"))
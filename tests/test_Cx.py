@@ -223,20 +223,6 @@ def test_mavrik_aero(id, mavrik_aero, actuator_outputs_values, \
     print("CX_Scale_r_close???", jnp.allclose(CX_Scale_r, expected_CX_Scale_r_values, atol=0.0001))
     if not jnp.allclose(CX_Scale_r, expected_CX_Scale_r_values, atol=0.0001):
         print(f"\n  Expected: {expected_CX_Scale_r_values}\n  Got: {CX_Scale_r}") 
-   
-    '''
-    print("wing_transform_close???", jnp.allclose(wing_transform, expected_wind_transform, atol=0.0001))
-    if not jnp.allclose(wing_transform, expected_wind_transform, atol=0.0001):
-        print(f"\n  Expected: {expected_wind_transform}\n  Got: {wing_transform}")
-        max_diff_index_wing_transform = jnp.argmax(jnp.abs(wing_transform - expected_wind_transform))
-        print(f"\n  Max difference in wing_transform at index {max_diff_index_wing_transform}: Expected {expected_wind_transform[max_diff_index_wing_transform]}, Got {wing_transform[max_diff_index_wing_transform]}")
-
-    print("tail_transform_close???", jnp.allclose(tail_transform, expected_tail_transform, atol=0.0001))
-    if not jnp.allclose(tail_transform, expected_tail_transform, atol=0.0001):
-        print(f"\n  Expected: {expected_tail_transform}\n  Got: {tail_transform}")
-        max_diff_index_tail_transform = jnp.argmax(jnp.abs(tail_transform - expected_tail_transform))
-        print(f"\n  Max difference in tail_transform at index {max_diff_index_tail_transform}: Expected {expected_tail_transform[max_diff_index_tail_transform]}, Got {tail_transform[max_diff_index_tail_transform]}")
-    '''
 
     CX_aileron_wing = mavrik_aero.CX_aileron_wing_lookup_table(jnp.array([
         u.wing_alpha, u.wing_beta, u.U, u.wing_RPM, u.wing_prop_alpha, u.wing_prop_beta, u.aileron
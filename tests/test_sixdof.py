@@ -69,4 +69,54 @@ def test_sixdof(id, rigid_body, vned, xned, euler, vb, pqr, forces, moments,
     print(f"Vb Expected: {expected_vb}, Got: {nxt_vb}, Close: {jnp.allclose(expected_vb, nxt_vb, atol=threshold)}, Max Error: {jnp.max(jnp.abs(expected_vb - nxt_vb))}")
     print(f"Euler Expected: {expected_euler}, Got: {nxt_euler}, Close: {jnp.allclose(expected_euler, nxt_euler, atol=threshold)}, Max Error: {jnp.max(jnp.abs(expected_euler - nxt_euler))}")
     print(f"pqr Expected: {expected_pqr}, Got: {nxt_pqr}, Close: {jnp.allclose(expected_pqr, nxt_pqr, atol=threshold)}, Max Error: {jnp.max(jnp.abs(expected_pqr - nxt_pqr))}")
-     
\ No newline at end of file
+     
+
+def test_sixdof_batched(rigid_body):
+    initial_states = SixDOFState(
+        Xned=xned_values[:-1],
+        Vb=vb_values[:-1],
+        Euler=euler_values[:-1],
+        pqr=pqr_values[:-1],
+        Vned=vned_values[:-1],
+    )
+
+    dynamics = SixDOFDynamics(rigid_body, method="rk4", fixed_step_size=0.01)
+    nxt_states, info = dynamics.run_simulation_batched(initial_states, forces_values[:-1], moments_values[:-1], 0.01)
+    assert info["states"].shape == (10, 1, 15)
+
+    for id in range(10):
+        initial_state = SixDOFState(
+            Xned=xned_values[id], Vb=vb_values[id], Euler=euler_values[id], pqr=pqr_values[id], Vned=vned_values[id]
+        )
+        nxt_state, _ = dynamics.run_simulation(initial_state, forces_values[id], moments_values[id], 0.01)
+        for batched, single in zip(nxt_states, nxt_state):
+            assert jnp.allclose(batched[id], single, atol=1e-5)
+
+
+def test_sixdof_forcing_schedule(rigid_body):
+    initial_state = SixDOFState(
+        Xned=xned_values[0], Vb=vb_values[0], Euler=euler_values[0], pqr=pqr_values[0], Vned=vned_values[0]
+    )
+
+    dynamics = SixDOFDynamics(rigid_body, method="rk4", fixed_step_size=0.01)
+    nxt_state, info = dynamics.run_simulation(initial_state, forces_values[:-1], moments_values[:-1], 0.1)
+    assert info["states"].shape == (10, 15)
+
+    state = initial_state
+    for id in range(10):
+        state, step_info = dynamics.run_simulation(state, forces_values[id], moments_values[id], 0.01)
+        assert jnp.allclose(info["states"][id], step_info["states"][-1], atol=1e-4)
+    for scheduled, stepped in zip(nxt_state, state):
+        assert jnp.allclose(scheduled, stepped, atol=1e-4)
+
+
+def test_sixdof_dopri5(rigid_body):
+    initial_state = SixDOFState(
+        Xned=xned_values[0], Vb=vb_values[0], Euler=euler_values[0], pqr=pqr_values[0], Vned=vned_values[0]
+    )
+
+    rk4_state, _ = SixDOFDynamics(rigid_body, method="rk4", fixed_step_size=0.01).run_simulation(initial_state, forces_values[0], moments_values[0], 0.1)
+    dopri5_state, info = SixDOFDynamics(rigid_body, method="DOPRI5", fixed_step_size=0.01).run_simulation(initial_state, forces_values[0], moments_values[0], 0.1)
+    assert info["states"].shape == (10, 15)
+    for dopri5, rk4 in zip(dopri5_state, rk4_state):
+        assert jnp.allclose(dopri5, rk4, atol=1e-3)